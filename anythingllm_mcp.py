@@ -6,13 +6,18 @@ Provides tools for managing workspaces, chatting, handling documents,
 and administering system settings via the AnythingLLM REST API.
 """
 
-import json
+import asyncio
 import os
-from typing import Optional, Any, cast
+import time
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from typing import Annotated, Optional, Any
 from enum import Enum
 
 import httpx
+import orjson
 from mcp.server.fastmcp import FastMCP
+from pydantic import Field
 
 # ──────────────────────────────────────────────
 # Configuration
@@ -20,6 +25,57 @@ from mcp.server.fastmcp import FastMCP
 
 API_BASE_URL = os.environ.get("ANYTHINGLLM_BASE_URL", "http://localhost:3001").rstrip("/")
 API_KEY = os.environ.get("ANYTHINGLLM_API_KEY", "")
+_URL_PREFIX = f"{API_BASE_URL}/api/v1"
+_API_KEY_OK = bool(API_KEY.strip())
+
+# ──────────────────────────────────────────────
+# HTTP client
+# ──────────────────────────────────────────────
+
+_CLIENT: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared AnythingLLM client, creating it on first use.
+
+    A single pooled client keeps connections alive between tool calls instead
+    of paying a new TCP/TLS handshake per request.
+    """
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            base_url=_URL_PREFIX,
+            headers={
+                "Authorization": f"Bearer {API_KEY}",
+                "Accept": "application/json",
+            },
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=httpx.Timeout(180.0, connect=10.0),
+            http2=True,
+        )
+    return _CLIENT
+
+
+_SESSIONS = 0
+
+
+@asynccontextmanager
+async def _lifespan(_server: FastMCP) -> AsyncIterator[None]:
+    """Close the shared HTTP client when the last MCP session ends.
+
+    FastMCP enters the lifespan once per session (every SSE or streamable-HTTP
+    connection), so the process-wide client must outlive any single session.
+    """
+    global _CLIENT, _SESSIONS
+    _SESSIONS += 1
+    try:
+        yield
+    finally:
+        _SESSIONS -= 1
+        if _SESSIONS == 0 and _CLIENT is not None:
+            client, _CLIENT = _CLIENT, None
+            await client.aclose()
+
 
 mcp = FastMCP(
     "anythingllm_mcp",
@@ -28,6 +84,7 @@ mcp = FastMCP(
         "document handling, embedding, and system administration tools. "
         "All tools require a running AnythingLLM instance."
     ),
+    lifespan=_lifespan,
 )
 
 # ──────────────────────────────────────────────
@@ -39,7 +96,7 @@ JsonPayload = dict[str, Any] | list[Any] | str
 
 def _require_api_key() -> None:
     """Ensure API key is configured before performing API calls."""
-    if not API_KEY.strip():
+    if not _API_KEY_OK:
         raise RuntimeError(
             "ANYTHINGLLM_API_KEY is not set. Configure it before using this MCP server."
         )
@@ -55,75 +112,158 @@ def _as_dict(payload: JsonPayload, endpoint: str) -> dict[str, Any]:
     )
 
 
-def _validate_range(name: str, value: float | int, minimum: float, maximum: float) -> None:
-    """Validate numeric value is within inclusive range."""
-    if value < minimum or value > maximum:
-        raise ValueError(f"{name} must be between {minimum} and {maximum}.")
+async def _request(
+    endpoint: str,
+    method: str = "GET",
+    body: dict | None = None,
+    params: dict | None = None,
+) -> httpx.Response:
+    """Send an authenticated request and raise on HTTP error status."""
+    _require_api_key()
+    response = await _get_client().request(method, endpoint, json=body, params=params)
+    response.raise_for_status()
+    return response
+
+
+def _is_json(response: httpx.Response) -> bool:
+    """Return True when the response declares a JSON body."""
+    return "application/json" in response.headers.get("content-type", "")
+
 
 async def _api(
     endpoint: str,
     method: str = "GET",
     body: dict | None = None,
     params: dict | None = None,
-    timeout: float = 180.0,
 ) -> JsonPayload:
     """Execute an authenticated request against the AnythingLLM API."""
-    _require_api_key()
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    }
-    url = f"{API_BASE_URL}/api/v1{endpoint}"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.request(
-            method,
-            url,
-            headers=headers,
-            json=body,
-            params=params,
-            timeout=timeout,
-        )
-        response.raise_for_status()
-        content_type = response.headers.get("content-type", "")
-        if "application/json" in content_type:
-            return response.json()
+    response = await _request(endpoint, method=method, body=body, params=params)
+    if _is_json(response):
+        return orjson.loads(response.content)
+    return response.text
+
+
+async def _api_raw(endpoint: str, params: dict | None = None) -> str:
+    """Fetch an endpoint and return its JSON body verbatim.
+
+    Used by pass-through tools to skip decoding the upstream payload only to
+    re-encode it. Non-JSON bodies are wrapped as a JSON string, as
+    `_json_response` would do.
+    """
+    response = await _request(endpoint, params=params)
+    if _is_json(response):
         return response.text
+    return _json_response(response.text)
+
+
+async def _api_stream_text(endpoint: str) -> str:
+    """Stream a GET response and return its body as text, without JSON decoding.
+
+    Intended for large exports: the body is never parsed into Python objects.
+    """
+    _require_api_key()
+    async with _get_client().stream("GET", endpoint) as response:
+        if response.is_error:
+            await response.aread()
+            response.raise_for_status()
+        chunks = [chunk async for chunk in response.aiter_bytes()]
+        text = b"".join(chunks).decode(response.encoding or "utf-8")
+    if _is_json(response):
+        return text
+    return _json_response(text)
+
+
+_CACHE_MAX_ENTRIES = 128
+_CACHE: dict[tuple, tuple[float, str]] = {}
+_CACHE_GENERATION = 0
+
+
+async def _api_cached(endpoint: str, ttl: float = 5.0, params: dict | None = None) -> str:
+    """Return `_api_raw` output, reusing a cached copy younger than `ttl` seconds.
+
+    Only for idempotent read-only endpoints. When the cache is full the oldest
+    entry (dict insertion order) is evicted. A response whose request overlapped
+    an invalidation is returned but not stored, since it may predate the write.
+    """
+    key = (endpoint, tuple(sorted(params.items())) if params else ())
+    now = time.monotonic()
+    cached = _CACHE.get(key)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+    generation = _CACHE_GENERATION
+    text = await _api_raw(endpoint, params=params)
+    if generation != _CACHE_GENERATION:
+        return text
+    _CACHE.pop(key, None)
+    _CACHE[key] = (now, text)
+    if len(_CACHE) > _CACHE_MAX_ENTRIES:
+        del _CACHE[next(iter(_CACHE))]
+    return text
+
+
+def _invalidate_cache(*prefixes: str) -> None:
+    """Drop cached responses whose endpoint starts with any of the prefixes."""
+    global _CACHE_GENERATION
+    _CACHE_GENERATION += 1
+    for key in [k for k in _CACHE if k[0].startswith(prefixes)]:
+        del _CACHE[key]
+
+
+_FANOUT_LIMIT = 10
+
+
+async def _gather_bounded(*aws: Awaitable[Any], limit: int = _FANOUT_LIMIT) -> list[Any]:
+    """Await concurrently with at most `limit` in flight.
+
+    Exceptions are returned in place of results rather than raised.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=True)
+
+
+_ERROR_MESSAGES = {
+    401: "Authentication failed. Check your ANYTHINGLLM_API_KEY.",
+    403: "Permission denied. Your API key may lack required permissions.",
+    404: "Resource not found. Check the slug or ID.",
+    429: "Rate limit exceeded. Wait before retrying.",
+    500: "Internal server error in AnythingLLM. Check LLM provider connectivity.",
+}
 
 
 def _handle_error(e: Exception) -> str:
     """Return a user-friendly error message."""
-    if isinstance(e, httpx.HTTPStatusError):
-        http_error = cast(httpx.HTTPStatusError, e)
-        status = http_error.response.status_code
-        try:
-            detail = http_error.response.json()
-        except Exception:
-            detail = http_error.response.text
-        messages = {
-            401: "Authentication failed. Check your ANYTHINGLLM_API_KEY.",
-            403: "Permission denied. Your API key may lack required permissions.",
-            404: "Resource not found. Check the slug or ID.",
-            429: "Rate limit exceeded. Wait before retrying.",
-            500: "Internal server error in AnythingLLM. Check LLM provider connectivity.",
-        }
-        msg = messages.get(status, f"API error (HTTP {status}).")
-        return f"Error: {msg}\nDetails: {json.dumps(detail) if isinstance(detail, dict) else detail}"
-    if isinstance(e, RuntimeError):
-        return f"Error: {e}"
-    if isinstance(e, httpx.TimeoutException):
-        return "Error: Request timed out. AnythingLLM may be busy or unreachable."
-    if isinstance(e, httpx.RequestError):
-        return f"Error: Request failed: {e}"
-    if isinstance(e, httpx.ConnectError):
-        return f"Error: Cannot connect to AnythingLLM at {API_BASE_URL}. Is it running?"
-    return f"Error: {type(e).__name__}: {e}"
-
-
-def _json_response(data: Any) -> str:
-    """Serialize data to pretty JSON."""
-    return json.dumps(data, indent=2, ensure_ascii=False, default=str)
+    match e:
+        case httpx.HTTPStatusError(response=response):
+            status = response.status_code
+            try:
+                detail = response.text
+            except Exception:
+                detail = ""
+            msg = _ERROR_MESSAGES.get(status, f"API error (HTTP {status}).")
+            return f"Error: {msg}\nDetails: {detail}"
+        case httpx.TimeoutException():
+            return "Error: Request timed out. AnythingLLM may be busy or unreachable."
+        case httpx.ConnectError():
+            return f"Error: Cannot connect to AnythingLLM at {API_BASE_URL}. Is it running?"
+        case httpx.RequestError():
+            return f"Error: Request failed: {e}"
+        case RuntimeError():
+            return f"Error: {e}"
+        case _:
+            return f"Error: {type(e).__name__}: {e}"
+
+
+def _json_response(data: Any, pretty: bool = False) -> str:
+    """Serialize data to JSON, compact unless `pretty` is set."""
+    option = orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=str, option=option).decode()
 
 
 # ──────────────────────────────────────────────
@@ -147,7 +287,7 @@ async def check_auth() -> str:
     """Verify that the API key is valid and AnythingLLM is reachable."""
     try:
         result = await _api("/auth")
-        return _json_response(result)
+        return _json_response(result, pretty=True)
     except Exception as e:
         return _handle_error(e)
 
@@ -160,21 +300,37 @@ async def check_auth() -> str:
     name="anythingllm_list_workspaces",
     annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True, "openWorldHint": False},
 )
-async def list_workspaces() -> str:
-    """List all workspaces in the AnythingLLM instance with their slugs, settings, and thread info."""
+async def list_workspaces(detailed: bool = False) -> str:
+    """List all workspaces in the AnythingLLM instance with their slugs, settings, and thread info.
+
+    Args:
+        detailed: Also fetch each workspace's full details (as returned by
+                  get_workspace), requested concurrently.
+    """
     try:
-        result = _as_dict(await _api("/workspaces"), "/workspaces")
+        result = _as_dict(orjson.loads(await _api_cached("/workspaces")), "/workspaces")
         workspaces = result.get("workspaces", [])
-        summary = []
-        for ws in workspaces:
-            summary.append({
+        summary = [
+            {
                 "name": ws.get("name"),
                 "slug": ws.get("slug"),
                 "chatMode": ws.get("chatMode", "chat"),
                 "vectorSearchMode": ws.get("vectorSearchMode"),
-                "threads": len(ws.get("threads", [])),
+                "threads": len(ws.get("threads") or ()),
                 "createdAt": ws.get("createdAt"),
-            })
+            }
+            for ws in workspaces
+        ]
+        if detailed:
+            with_slug = [entry for entry in summary if entry["slug"]]
+            details = await _gather_bounded(
+                *(_api_cached(f"/workspace/{entry['slug']}") for entry in with_slug)
+            )
+            for entry, detail in zip(with_slug, details):
+                if isinstance(detail, Exception):
+                    entry["details"] = _handle_error(detail)
+                else:
+                    entry["details"] = orjson.loads(detail)
         return _json_response({"total": len(summary), "workspaces": summary})
     except Exception as e:
         return _handle_error(e)
@@ -191,8 +347,7 @@ async def get_workspace(slug: str) -> str:
         slug: Workspace slug (e.g. 'papers', 'lands')
     """
     try:
-        result = await _api(f"/workspace/{slug}")
-        return _json_response(result)
+        return await _api_cached(f"/workspace/{slug}")
     except Exception as e:
         return _handle_error(e)
 
@@ -209,6 +364,7 @@ async def create_workspace(name: str) -> str:
     """
     try:
         result = await _api("/workspace/new", method="POST", body={"name": name})
+        _invalidate_cache("/workspace")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -221,11 +377,11 @@ async def create_workspace(name: str) -> str:
 async def update_workspace(
     slug: str,
     name: Optional[str] = None,
-    openAiTemp: Optional[float] = None,
-    openAiHistory: Optional[int] = None,
+    openAiTemp: Optional[Annotated[float, Field(ge=0.0, le=1.0)]] = None,
+    openAiHistory: Optional[Annotated[int, Field(ge=0, le=100)]] = None,
     openAiPrompt: Optional[str] = None,
-    similarityThreshold: Optional[float] = None,
-    topN: Optional[int] = None,
+    similarityThreshold: Optional[Annotated[float, Field(ge=0.0, le=1.0)]] = None,
+    topN: Optional[Annotated[int, Field(ge=1, le=20)]] = None,
     chatMode: Optional[ChatMode] = None,
 ) -> str:
     """Update workspace settings (name, temperature, prompt, similarity threshold, etc.).
@@ -241,28 +397,25 @@ async def update_workspace(
         chatMode: Chat mode: 'chat' or 'query'
     """
     try:
+        updates: dict[str, Any] = {}
+        if name is not None:
+            updates["name"] = name
         if openAiTemp is not None:
-            _validate_range("openAiTemp", openAiTemp, 0.0, 1.0)
+            updates["openAiTemp"] = openAiTemp
         if openAiHistory is not None:
-            _validate_range("openAiHistory", openAiHistory, 0, 100)
+            updates["openAiHistory"] = openAiHistory
+        if openAiPrompt is not None:
+            updates["openAiPrompt"] = openAiPrompt
         if similarityThreshold is not None:
-            _validate_range("similarityThreshold", similarityThreshold, 0.0, 1.0)
+            updates["similarityThreshold"] = similarityThreshold
         if topN is not None:
-            _validate_range("topN", topN, 1, 20)
-
-        all_params = {
-            "name": name,
-            "openAiTemp": openAiTemp,
-            "openAiHistory": openAiHistory,
-            "openAiPrompt": openAiPrompt,
-            "similarityThreshold": similarityThreshold,
-            "topN": topN,
-            "chatMode": chatMode.value if chatMode else None,
-        }
-        updates = {k: v for k, v in all_params.items() if v is not None}
+            updates["topN"] = topN
+        if chatMode is not None:
+            updates["chatMode"] = chatMode
         if not updates:
             return "Error: No updates provided."
         result = await _api(f"/workspace/{slug}/update", method="POST", body=updates)
+        _invalidate_cache("/workspace")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -280,11 +433,42 @@ async def delete_workspace(slug: str) -> str:
     """
     try:
         await _api(f"/workspace/{slug}", method="DELETE")
+        _invalidate_cache("/workspace", "/system/vector-count")
         return f"Workspace '{slug}' deleted successfully."
     except Exception as e:
         return _handle_error(e)
 
 
+@mcp.tool(
+    name="anythingllm_bulk_delete_workspaces",
+    annotations={"readOnlyHint": False, "destructiveHint": True, "idempotentHint": False, "openWorldHint": False},
+)
+async def bulk_delete_workspaces(slugs: list[str]) -> str:
+    """Permanently delete several workspaces at once. This action cannot be undone.
+
+    Deletions run concurrently; a failure for one slug does not stop the others.
+
+    Args:
+        slugs: Workspace slugs to delete.
+    """
+    try:
+        if not slugs:
+            return "Error: 'slugs' list cannot be empty."
+        results = await _gather_bounded(
+            *(_api(f"/workspace/{slug}", method="DELETE") for slug in slugs)
+        )
+        _invalidate_cache("/workspace", "/system/vector-count")
+        deleted = [slug for slug, result in zip(slugs, results) if not isinstance(result, Exception)]
+        failed = [
+            {"slug": slug, "error": _handle_error(result)}
+            for slug, result in zip(slugs, results)
+            if isinstance(result, Exception)
+        ]
+        return _json_response({"deleted": deleted, "failed": failed})
+    except Exception as e:
+        return _handle_error(e)
+
+
 # ──────────────────────────────────────────────
 # Tools: Chat
 # ──────────────────────────────────────────────
@@ -308,7 +492,7 @@ async def chat_with_workspace(slug: str, message: str, mode: ChatMode = ChatMode
         result = await _api(
             f"/workspace/{slug}/chat",
             method="POST",
-            body={"message": message, "mode": mode.value},
+            body={"message": message, "mode": mode},
         )
         return _json_response(result)
     except Exception as e:
@@ -326,8 +510,7 @@ async def get_chat_history(slug: str) -> str:
         slug: Workspace slug
     """
     try:
-        result = await _api(f"/workspace/{slug}/chats")
-        return _json_response(result)
+        return await _api_raw(f"/workspace/{slug}/chats")
     except Exception as e:
         return _handle_error(e)
 
@@ -352,6 +535,7 @@ async def create_thread(slug: str, name: Optional[str] = None) -> str:
         if name:
             body["name"] = name
         result = await _api(f"/workspace/{slug}/thread/new", method="POST", body=body)
+        _invalidate_cache("/workspace")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -370,6 +554,7 @@ async def delete_thread(slug: str, thread_slug: str) -> str:
     """
     try:
         await _api(f"/workspace/{slug}/thread/{thread_slug}", method="DELETE")
+        _invalidate_cache("/workspace")
         return f"Thread '{thread_slug}' deleted from workspace '{slug}'."
     except Exception as e:
         return _handle_error(e)
@@ -393,6 +578,7 @@ async def update_thread(slug: str, thread_slug: str, name: str) -> str:
             method="POST",
             body={"name": name},
         )
+        _invalidate_cache("/workspace")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -420,7 +606,7 @@ async def chat_in_thread(
         result = await _api(
             f"/workspace/{slug}/thread/{thread_slug}/chat",
             method="POST",
-            body={"message": message, "mode": mode.value},
+            body={"message": message, "mode": mode},
         )
         return _json_response(result)
     except Exception as e:
@@ -439,8 +625,7 @@ async def get_thread_chats(slug: str, thread_slug: str) -> str:
         thread_slug: Thread slug
     """
     try:
-        result = await _api(f"/workspace/{slug}/thread/{thread_slug}/chats")
-        return _json_response(result)
+        return await _api_raw(f"/workspace/{slug}/thread/{thread_slug}/chats")
     except Exception as e:
         return _handle_error(e)
 
@@ -456,8 +641,7 @@ async def get_thread_chats(slug: str, thread_slug: str) -> str:
 async def list_documents() -> str:
     """List all uploaded documents across all folders."""
     try:
-        result = await _api("/documents")
-        return _json_response(result)
+        return await _api_cached("/documents")
     except Exception as e:
         return _handle_error(e)
 
@@ -469,8 +653,7 @@ async def list_documents() -> str:
 async def get_accepted_file_types() -> str:
     """Get the list of file types that AnythingLLM accepts for upload."""
     try:
-        result = await _api("/document/accepted-file-types")
-        return _json_response(result)
+        return await _api_cached("/document/accepted-file-types")
     except Exception as e:
         return _handle_error(e)
 
@@ -493,6 +676,7 @@ async def upload_link(link: str) -> str:
             method="POST",
             body={"link": link},
         )
+        _invalidate_cache("/documents")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -515,27 +699,19 @@ async def upload_file(file_path: str) -> str:
             return f"Error: File not found: {file_path}"
             
         _require_api_key()
-        headers = {
-            "Authorization": f"Bearer {API_KEY}",
-            "Accept": "application/json",
-        }
-        url = f"{API_BASE_URL}/api/v1/document/upload"
-        
-        async with httpx.AsyncClient() as client:
-            with open(file_path, "rb") as f:
-                # Add a dummy content-type so httpx figures it's a file
-                files = {"file": (path.name, f)}
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    files=files,
-                    timeout=300.0,
-                )
-                response.raise_for_status()
-                content_type = response.headers.get("content-type", "")
-                if "application/json" in content_type:
-                    return _json_response(response.json())
-                return _json_response(response.text)
+        with open(file_path, "rb") as f:
+            # Add a dummy content-type so httpx figures it's a file
+            files = {"file": (path.name, f)}
+            response = await _get_client().post(
+                "/document/upload",
+                files=files,
+                timeout=300.0,
+            )
+        response.raise_for_status()
+        _invalidate_cache("/documents")
+        if _is_json(response):
+            return _json_response(orjson.loads(response.content))
+        return _json_response(response.text)
     except Exception as e:
         return _handle_error(e)
 
@@ -557,6 +733,7 @@ async def upload_raw_text(text_content: str, title: str) -> str:
             method="POST",
             body={"textContent": text_content, "metadata": {"title": title}},
         )
+        _invalidate_cache("/documents")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -580,26 +757,18 @@ async def upload_file_to_folder(file_path: str, folder_name: str) -> str:
             return f"Error: File not found: {file_path}"
 
         _require_api_key()
-        headers = {
-            "Authorization": f"Bearer {API_KEY}",
-            "Accept": "application/json",
-        }
-        url = f"{API_BASE_URL}/api/v1/document/upload/{folder_name}"
-
-        async with httpx.AsyncClient() as client:
-            with open(file_path, "rb") as f:
-                files = {"file": (path.name, f)}
-                response = await client.post(
-                    url,
-                    headers=headers,
-                    files=files,
-                    timeout=300.0,
-                )
-                response.raise_for_status()
-                content_type = response.headers.get("content-type", "")
-                if "application/json" in content_type:
-                    return _json_response(response.json())
-                return _json_response(response.text)
+        with open(file_path, "rb") as f:
+            files = {"file": (path.name, f)}
+            response = await _get_client().post(
+                f"/document/upload/{folder_name}",
+                files=files,
+                timeout=300.0,
+            )
+        response.raise_for_status()
+        _invalidate_cache("/documents")
+        if _is_json(response):
+            return _json_response(orjson.loads(response.content))
+        return _json_response(response.text)
     except Exception as e:
         return _handle_error(e)
 
@@ -615,8 +784,7 @@ async def list_documents_in_folder(folder_name: str) -> str:
         folder_name: Folder name to list documents from.
     """
     try:
-        result = await _api(f"/documents/folder/{folder_name}")
-        return _json_response(result)
+        return await _api_raw(f"/documents/folder/{folder_name}")
     except Exception as e:
         return _handle_error(e)
 
@@ -635,8 +803,7 @@ async def get_document(doc_name: str) -> str:
         doc_name: Document name/path as returned by the documents API.
     """
     try:
-        result = await _api(f"/document/{doc_name}")
-        return _json_response(result)
+        return await _api_raw(f"/document/{doc_name}")
     except Exception as e:
         return _handle_error(e)
 
@@ -648,8 +815,7 @@ async def get_document(doc_name: str) -> str:
 async def get_document_metadata_schema() -> str:
     """Get the metadata schema that AnythingLLM uses for documents."""
     try:
-        result = await _api("/document/metadata-schema")
-        return _json_response(result)
+        return await _api_raw("/document/metadata-schema")
     except Exception as e:
         return _handle_error(e)
 
@@ -666,6 +832,7 @@ async def create_folder(name: str) -> str:
     """
     try:
         result = await _api("/document/create-folder", method="POST", body={"name": name})
+        _invalidate_cache("/documents")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -683,6 +850,7 @@ async def remove_folder(name: str) -> str:
     """
     try:
         result = await _api("/document/remove-folder", method="DELETE", body={"name": name})
+        _invalidate_cache("/documents", "/workspace", "/system/vector-count")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -710,6 +878,7 @@ async def move_files(files: list[dict[str, str]]) -> str:
             if "from" not in entry or "to" not in entry:
                 return "Error: Each entry in 'files' must have 'from' and 'to' keys."
         result = await _api("/document/move-files", method="POST", body={"files": files})
+        _invalidate_cache("/documents", "/workspace")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -756,6 +925,7 @@ async def update_embeddings(
             method="POST",
             body=body,
         )
+        _invalidate_cache("/workspace", "/system/vector-count")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -783,6 +953,7 @@ async def update_pin(slug: str, doc_path: str, pinned: bool) -> str:
             method="POST",
             body={"docPath": doc_path, "pinStatus": pinned},
         )
+        _invalidate_cache("/workspace")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -796,7 +967,12 @@ async def update_pin(slug: str, doc_path: str, pinned: bool) -> str:
     name="anythingllm_search",
     annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True, "openWorldHint": False},
 )
-async def search_workspace(slug: str, query: str, top_n: int = 4, score_threshold: Optional[float] = None) -> str:
+async def search_workspace(
+    slug: str,
+    query: str,
+    top_n: Annotated[int, Field(ge=1, le=20)] = 4,
+    score_threshold: Optional[Annotated[float, Field(ge=0.0, le=1.0)]] = None,
+) -> str:
     """Search for relevant document chunks within a workspace using vector similarity.
 
     Args:
@@ -806,10 +982,8 @@ async def search_workspace(slug: str, query: str, top_n: int = 4, score_threshol
         score_threshold: Similarity score threshold (0-1). Lower = more results.
     """
     try:
-        _validate_range("top_n", top_n, 1, 20)
         body: dict = {"query": query, "topN": top_n}
         if score_threshold is not None:
-            _validate_range("score_threshold", score_threshold, 0.0, 1.0)
             body["scoreThreshold"] = score_threshold
         result = await _api(
             f"/workspace/{slug}/vector-search",
@@ -832,7 +1006,7 @@ async def search_workspace(slug: str, query: str, top_n: int = 4, score_threshol
 async def get_system_settings() -> str:
     """Get AnythingLLM system settings (LLM provider, vector DB, embeddings, etc.)."""
     try:
-        result = _as_dict(await _api("/system"), "/system")
+        result = _as_dict(orjson.loads(await _api_cached("/system")), "/system")
         settings = result.get("settings", {})
         safe_keys = [
             "LLMProvider", "LLMModel", "VectorDB", "EmbeddingEngine",
@@ -841,7 +1015,7 @@ async def get_system_settings() -> str:
             "TextToSpeechProvider", "OllamaLLMBasePath", "OllamaLLMModelPref",
         ]
         filtered = {k: settings.get(k) for k in safe_keys if settings.get(k) is not None}
-        return _json_response({"settings": filtered})
+        return _json_response({"settings": filtered}, pretty=True)
     except Exception as e:
         return _handle_error(e)
 
@@ -853,8 +1027,7 @@ async def get_system_settings() -> str:
 async def get_vector_count() -> str:
     """Get the total number of vectors stored in the system."""
     try:
-        result = await _api("/system/vector-count")
-        return _json_response(result)
+        return await _api_cached("/system/vector-count")
     except Exception as e:
         return _handle_error(e)
 
@@ -866,8 +1039,7 @@ async def get_vector_count() -> str:
 async def export_chats() -> str:
     """Export all chat logs from all workspaces."""
     try:
-        result = await _api("/system/export-chats")
-        return _json_response(result)
+        return await _api_stream_text("/system/export-chats")
     except Exception as e:
         return _handle_error(e)
 
@@ -894,6 +1066,7 @@ async def remove_documents(names: list[str]) -> str:
             method="DELETE",
             body={"names": names},
         )
+        _invalidate_cache("/documents", "/workspace", "/system/vector-count")
         return _json_response(result)
     except Exception as e:
         return _handle_error(e)
@@ -910,8 +1083,7 @@ async def remove_documents(names: list[str]) -> str:
 async def list_embeds() -> str:
     """List all embed configurations (public chat widgets)."""
     try:
-        result = await _api("/embed")
-        return _json_response(result)
+        return await _api_cached("/embed")
     except Exception as e:
         return _handle_error(e)
 
@@ -927,8 +1099,7 @@ async def list_embeds() -> str:
 async def list_models() -> str:
     """List available models via the OpenAI-compatible endpoint."""
     try:
-        result = await _api("/openai/models")
-        return _json_response(result)
+        return await _api_cached("/openai/models")
     except Exception as e:
         return _handle_error(e)
 
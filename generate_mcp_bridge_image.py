@@ -4,7 +4,9 @@ MCP Bridge: AnythingLLM ↔ VS Code/Cursor/Claude
 """
 
 from PIL import Image, ImageDraw, ImageFont
-import math
+import numpy as np
+import shutil
+import subprocess
 
 # Image dimensions - 16:9 ratio for Medium preview
 WIDTH = 1600
@@ -49,37 +51,30 @@ draw.ellipse([hub_x - hub_radius, hub_y - hub_radius,
 # Inner circle (data layers) - dashed effect
 inner_r = 100
 segments = 24
-for i in range(segments):
-    if i % 2 == 0:
-        angle1 = (i / segments) * 2 * math.pi
-        angle2 = ((i + 1) / segments) * 2 * math.pi
-        x1 = hub_x + inner_r * math.cos(angle1)
-        y1 = hub_y + inner_r * math.sin(angle1)
-        x2 = hub_x + inner_r * math.cos(angle2)
-        y2 = hub_y + inner_r * math.sin(angle2)
-        draw.line([(x1, y1), (x2, y2)], fill=ACCENT_CYAN + (100,), width=2)
+dash_angles = 2 * np.pi * np.arange(segments + 1) / segments
+dash_x = hub_x + inner_r * np.cos(dash_angles)
+dash_y = hub_y + inner_r * np.sin(dash_angles)
+for i in range(0, segments, 2):
+    draw.line([(dash_x[i], dash_y[i]), (dash_x[i + 1], dash_y[i + 1])],
+              fill=ACCENT_CYAN + (100,), width=2)
 
 # CENTER: MCP Protocol Layer (Hexagon - connection, protocol)
 hex_x, hex_y = 800, 450
 hex_radius = 100
 
 # Calculate hexagon vertices
-hex_vertices = []
-for i in range(6):
-    angle = math.pi / 3 * i - math.pi / 6
-    x = hex_x + hex_radius * math.cos(angle)
-    y = hex_y + hex_radius * math.sin(angle)
-    hex_vertices.append((x, y))
+hex_angles = np.pi / 3 * np.arange(6)
+hex_vertices = list(zip(hex_x + hex_radius * np.cos(hex_angles - np.pi / 6),
+                        hex_y + hex_radius * np.sin(hex_angles - np.pi / 6)))
 
 # Draw filled hexagon
 draw.polygon(hex_vertices, fill=ACCENT_AMBER + (230,), outline=ACCENT_CYAN, width=4)
 
 # MCP inner structure (protocol channels)
 inner_hex_r = 65
-for i in range(6):
-    angle = math.pi / 3 * i
-    x = hex_x + inner_hex_r * math.cos(angle)
-    y = hex_y + inner_hex_r * math.sin(angle)
+spoke_ends = zip(hex_x + inner_hex_r * np.cos(hex_angles),
+                 hex_y + inner_hex_r * np.sin(hex_angles))
+for x, y in spoke_ends:
     draw.line([(hex_x, hex_y), (x, y)], fill=BG_COLOR + (200,), width=3)
 
 # RIGHT: Client Interfaces (Stacked rounded rectangles)
@@ -212,9 +207,11 @@ draw.text((WIDTH - 300, HEIGHT - 40), tech_text, fill=GRAY_LIGHT + (150,), font=
 draw.text((20, 20), "00", fill=GRAY_DARK, font=font_tiny)
 draw.text((WIDTH - 40, HEIGHT - 40), "16", fill=GRAY_DARK, font=font_tiny)
 
-# Save with high quality
+# Save quickly; recompress with oxipng when it is installed
 output_path = 'a:/Docker/Meus artigos/anythingllm-mcp-bridge.png'
-img.save(output_path, 'PNG', optimize=True, quality=95)
+img.save(output_path, 'PNG', optimize=False, compress_level=6)
+if shutil.which('oxipng'):
+    subprocess.run(['oxipng', '-o', '2', '--quiet', output_path], check=False)
 print("✓ Image created: anythingllm-mcp-bridge.png")
 print(f"  Resolution: {WIDTH}x{HEIGHT} pixels (16:9)")
 print(f"  Philosophy: Protocol Geometry")
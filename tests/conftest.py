@@ -0,0 +1,7 @@
+import asyncio
+import sys
+
+if sys.platform != "win32":
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
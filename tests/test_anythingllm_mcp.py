@@ -1,49 +1,159 @@
+from __future__ import annotations
+
 import asyncio
+import inspect
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
 import httpx
-import respx
+import pytest
+from mcp.server.fastmcp.exceptions import ToolError
 
 import anythingllm_mcp as server
 
-
-def test_check_auth_requires_api_key() -> None:
-    original_key = server.API_KEY
-    try:
-        server.API_KEY = ""
-        result = asyncio.run(server.check_auth())
-        assert "ANYTHINGLLM_API_KEY is not set" in result
-    finally:
-        server.API_KEY = original_key
-
-
-def test_check_auth_success_json_response() -> None:
-    original_key = server.API_KEY
-    original_base = server.API_BASE_URL
-    try:
-        server.API_KEY = "test-token"
-        server.API_BASE_URL = "http://localhost:3001"
-
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get("http://localhost:3001/api/v1/auth").respond(
-                status_code=200,
-                json={"ok": True},
-            )
-            result = asyncio.run(server.check_auth())
-
-        assert '"ok": true' in result
-    finally:
-        server.API_KEY = original_key
-        server.API_BASE_URL = original_base
-
-
-def test_search_workspace_rejects_invalid_top_n() -> None:
-    result = asyncio.run(server.search_workspace("demo", "query", top_n=0))
-    assert "top_n must be between 1 and 20" in result
-
-
-def test_handle_error_timeout_message() -> None:
-    message = server._handle_error(httpx.TimeoutException("timeout"))
-    assert "Request timed out" in message
+if TYPE_CHECKING:
+    import respx
+
+_TIMEOUT_EXC = httpx.TimeoutException("timeout")
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def session_loop() -> AsyncIterator[None]:
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=2, thread_name_prefix="tests"))
+    yield
+    if server._CLIENT is not None:
+        await server._CLIENT.aclose()
+
+
+@pytest.fixture(scope="module")
+def module_router() -> Iterator[respx.MockRouter]:
+    import respx
+
+    with respx.mock(assert_all_called=False) as mock_router:
+        yield mock_router
+
+
+@pytest.fixture
+def router(module_router: respx.MockRouter) -> Iterator[respx.MockRouter]:
+    yield module_router
+    module_router.clear()
+    module_router.reset()
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache() -> None:
+    server._CACHE.clear()
+
+
+@pytest.fixture
+def api_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(server, "API_KEY", "test-token")
+    monkeypatch.setattr(server, "_API_KEY_OK", True)
+
+
+@pytest.mark.parametrize(
+    ("call", "expected"),
+    [
+        pytest.param(
+            lambda: server.check_auth(),
+            "Error: ANYTHINGLLM_API_KEY is not set",
+            id="missing-api-key",
+        ),
+        pytest.param(
+            lambda: server._handle_error(_TIMEOUT_EXC),
+            "Error: Request timed out",
+            id="timeout",
+        ),
+        pytest.param(
+            lambda: server._handle_error(httpx.ConnectError("refused")),
+            "Error: Cannot connect to AnythingLLM",
+            id="connect-error",
+        ),
+        pytest.param(
+            lambda: server.move_files([]),
+            "Error: 'files' list cannot be empty",
+            id="move-empty",
+        ),
+        pytest.param(
+            lambda: server.move_files([{"from": "a"}]),
+            "Error: Each entry in 'files' must have 'from' and 'to' keys",
+            id="move-missing-keys",
+        ),
+        pytest.param(
+            lambda: server.remove_documents([]),
+            "Error: 'names' list cannot be empty",
+            id="remove-empty",
+        ),
+        pytest.param(
+            lambda: server.bulk_delete_workspaces([]),
+            "Error: 'slugs' list cannot be empty",
+            id="bulk-delete-empty",
+        ),
+        pytest.param(
+            lambda: server.update_workspace("demo"),
+            "Error: No updates provided",
+            id="no-updates",
+        ),
+    ],
+)
+async def test_error_messages(
+    monkeypatch: pytest.MonkeyPatch,
+    call: Callable[[], str | Awaitable[str]],
+    expected: str,
+) -> None:
+    monkeypatch.setattr(server, "API_KEY", "")
+    monkeypatch.setattr(server, "_API_KEY_OK", False)
+    result = call()
+    if inspect.isawaitable(result):
+        result = await result
+    assert result.startswith(expected)
+
+
+@pytest.mark.parametrize(
+    ("tool", "arguments", "expected"),
+    [
+        ("anythingllm_search", {"slug": "demo", "query": "query", "top_n": 0}, "top_n"),
+        ("anythingllm_update_workspace", {"slug": "demo", "openAiTemp": 1.5}, "openAiTemp"),
+    ],
+)
+async def test_tool_rejects_out_of_range_arguments(
+    tool: str,
+    arguments: dict,
+    expected: str,
+) -> None:
+    with pytest.raises(ToolError, match=expected):
+        await server.mcp.call_tool(tool, arguments)
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_check_auth_success_json_response(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url=server._URL_PREFIX)
+    monkeypatch.setattr(server, "_CLIENT", client)
+    result = await server.check_auth()
+    await client.aclose()
+
+    assert [request.url.path for request in requests] == ["/api/v1/auth"]
+    assert '"ok": true' in result
+
+
+def test_json_response_keeps_unicode_and_non_string_keys() -> None:
+    result = server._json_response({"name": "Ação", 1: server.ChatMode.QUERY})
+    assert result == '{"name":"Ação","1":"query"}'
+
+
+def test_json_response_pretty_indents_output() -> None:
+    assert server._json_response({"ok": True}, pretty=True) == '{\n  "ok": true\n}'
 
 
 # ──────────────────────────────────────────────
@@ -51,139 +161,356 @@ def test_handle_error_timeout_message() -> None:
 # ──────────────────────────────────────────────
 
 
-def test_create_folder_success() -> None:
-    original_key, original_base = server.API_KEY, server.API_BASE_URL
-    try:
-        server.API_KEY = "test-token"
-        server.API_BASE_URL = "http://localhost:3001"
-        with respx.mock(assert_all_called=True) as mock:
-            mock.post("http://localhost:3001/api/v1/document/create-folder").respond(
-                status_code=200,
-                json={"success": True, "message": "Folder created"},
-            )
-            result = asyncio.run(server.create_folder("my-folder"))
-        assert '"success": true' in result
-    finally:
-        server.API_KEY = original_key
-        server.API_BASE_URL = original_base
-
-
-def test_remove_folder_success() -> None:
-    original_key, original_base = server.API_KEY, server.API_BASE_URL
-    try:
-        server.API_KEY = "test-token"
-        server.API_BASE_URL = "http://localhost:3001"
-        with respx.mock(assert_all_called=True) as mock:
-            mock.request("DELETE", "http://localhost:3001/api/v1/document/remove-folder").respond(
-                status_code=200,
-                json={"success": True},
-            )
-            result = asyncio.run(server.remove_folder("my-folder"))
-        assert '"success": true' in result
-    finally:
-        server.API_KEY = original_key
-        server.API_BASE_URL = original_base
-
-
-def test_list_documents_in_folder_success() -> None:
-    original_key, original_base = server.API_KEY, server.API_BASE_URL
-    try:
-        server.API_KEY = "test-token"
-        server.API_BASE_URL = "http://localhost:3001"
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get("http://localhost:3001/api/v1/documents/folder/pine-scripts").respond(
-                status_code=200,
-                json={"localFiles": {"items": []}},
-            )
-            result = asyncio.run(server.list_documents_in_folder("pine-scripts"))
-        assert '"localFiles"' in result
-    finally:
-        server.API_KEY = original_key
-        server.API_BASE_URL = original_base
-
-
-def test_move_files_rejects_empty_list() -> None:
-    result = asyncio.run(server.move_files([]))
-    assert "'files' list cannot be empty" in result
-
-
-def test_move_files_rejects_missing_keys() -> None:
-    result = asyncio.run(server.move_files([{"from": "a"}]))
-    assert "'from' and 'to'" in result
-
-
-def test_update_pin_success() -> None:
-    original_key, original_base = server.API_KEY, server.API_BASE_URL
-    try:
-        server.API_KEY = "test-token"
-        server.API_BASE_URL = "http://localhost:3001"
-        with respx.mock(assert_all_called=True) as mock:
-            mock.post("http://localhost:3001/api/v1/workspace/demo/update-pin").respond(
-                status_code=200,
-                json={"success": True},
-            )
-            result = asyncio.run(server.update_pin("demo", "custom-documents/test.json", True))
-        assert '"success": true' in result
-    finally:
-        server.API_KEY = original_key
-        server.API_BASE_URL = original_base
-
-
-def test_update_thread_success() -> None:
-    original_key, original_base = server.API_KEY, server.API_BASE_URL
-    try:
-        server.API_KEY = "test-token"
-        server.API_BASE_URL = "http://localhost:3001"
-        with respx.mock(assert_all_called=True) as mock:
-            mock.post(
-                "http://localhost:3001/api/v1/workspace/demo/thread/t-slug/update"
-            ).respond(
-                status_code=200,
-                json={"thread": {"slug": "t-slug", "name": "new-name"}},
-            )
-            result = asyncio.run(server.update_thread("demo", "t-slug", "new-name"))
-        assert '"new-name"' in result
-    finally:
-        server.API_KEY = original_key
-        server.API_BASE_URL = original_base
-
-
-def test_remove_documents_rejects_empty_list() -> None:
-    result = asyncio.run(server.remove_documents([]))
-    assert "'names' list cannot be empty" in result
-
-
-def test_remove_documents_success() -> None:
-    original_key, original_base = server.API_KEY, server.API_BASE_URL
-    try:
-        server.API_KEY = "test-token"
-        server.API_BASE_URL = "http://localhost:3001"
-        with respx.mock(assert_all_called=True) as mock:
-            mock.request(
-                "DELETE", "http://localhost:3001/api/v1/system/remove-documents"
-            ).respond(
-                status_code=200,
-                json={"success": True},
-            )
-            result = asyncio.run(server.remove_documents(["custom-documents/test.json"]))
-        assert '"success": true' in result
-    finally:
-        server.API_KEY = original_key
-        server.API_BASE_URL = original_base
-
-
-def test_get_document_metadata_schema_success() -> None:
-    original_key, original_base = server.API_KEY, server.API_BASE_URL
-    try:
-        server.API_KEY = "test-token"
-        server.API_BASE_URL = "http://localhost:3001"
-        with respx.mock(assert_all_called=True) as mock:
-            mock.get("http://localhost:3001/api/v1/document/metadata-schema").respond(
-                status_code=200,
-                json={"schema": {"title": "string"}},
-            )
-            result = asyncio.run(server.get_document_metadata_schema())
-        assert '"schema"' in result
-    finally:
-        server.API_KEY = original_key
-        server.API_BASE_URL = original_base
+@pytest.mark.usefixtures("api_key")
+async def test_create_folder_success(
+    router: respx.MockRouter,
+) -> None:
+    route = router.post("http://localhost:3001/api/v1/document/create-folder").respond(
+        status_code=200,
+        json={"success": True, "message": "Folder created"},
+    )
+    result = await server.create_folder("my-folder")
+    assert route.called
+    assert '"success":true' in result
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_remove_folder_success(
+    router: respx.MockRouter,
+) -> None:
+    route = router.request("DELETE", "http://localhost:3001/api/v1/document/remove-folder").respond(
+        status_code=200,
+        json={"success": True},
+    )
+    result = await server.remove_folder("my-folder")
+    assert route.called
+    assert '"success":true' in result
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_list_documents_in_folder_success(
+    router: respx.MockRouter,
+) -> None:
+    route = router.get("http://localhost:3001/api/v1/documents/folder/pine-scripts").respond(
+        status_code=200,
+        json={"localFiles": {"items": []}},
+    )
+    result = await server.list_documents_in_folder("pine-scripts")
+    assert route.called
+    assert '"localFiles"' in result
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_update_pin_success(
+    router: respx.MockRouter,
+) -> None:
+    route = router.post("http://localhost:3001/api/v1/workspace/demo/update-pin").respond(
+        status_code=200,
+        json={"success": True},
+    )
+    result = await server.update_pin("demo", "custom-documents/test.json", True)
+    assert route.called
+    assert '"success":true' in result
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_update_thread_success(
+    router: respx.MockRouter,
+) -> None:
+    route = router.post(
+        "http://localhost:3001/api/v1/workspace/demo/thread/t-slug/update"
+    ).respond(
+        status_code=200,
+        json={"thread": {"slug": "t-slug", "name": "new-name"}},
+    )
+    result = await server.update_thread("demo", "t-slug", "new-name")
+    assert route.called
+    assert '"new-name"' in result
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_remove_documents_success(
+    router: respx.MockRouter,
+) -> None:
+    route = router.request(
+        "DELETE", "http://localhost:3001/api/v1/system/remove-documents"
+    ).respond(
+        status_code=200,
+        json={"success": True},
+    )
+    result = await server.remove_documents(["custom-documents/test.json"])
+    assert route.called
+    assert '"success":true' in result
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_get_document_metadata_schema_success(
+    router: respx.MockRouter,
+) -> None:
+    route = router.get("http://localhost:3001/api/v1/document/metadata-schema").respond(
+        status_code=200,
+        json={"schema": {"title": "string"}},
+    )
+    result = await server.get_document_metadata_schema()
+    assert route.called
+    assert '"schema"' in result
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_api_reuses_shared_client(
+    router: respx.MockRouter,
+) -> None:
+    route = router.get("http://localhost:3001/api/v1/auth").respond(
+        status_code=200,
+        json={"ok": True},
+    )
+    await server.check_auth()
+    client = server._CLIENT
+    await server.check_auth()
+    assert route.call_count == 2
+    assert client is not None and server._CLIENT is client
+    assert route.calls.last.request.headers["Authorization"] == "Bearer test-token"
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_lifespan_keeps_client_open_while_other_sessions_run(
+    router: respx.MockRouter,
+) -> None:
+    route = router.get("http://localhost:3001/api/v1/auth").respond(
+        status_code=200,
+        json={"ok": True},
+    )
+    async with server._lifespan(server.mcp):
+        async with server._lifespan(server.mcp):
+            await server.check_auth()
+        client = server._CLIENT
+        result = await server.check_auth()
+        assert not result.startswith("Error:")
+        assert route.call_count == 2
+    assert client is not None and client.is_closed
+    assert server._CLIENT is None
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_get_workspace_returns_upstream_body_verbatim(
+    router: respx.MockRouter,
+) -> None:
+    body = '{"workspace":[{"slug":"demo","name":"Demo"}]}'
+    route = router.get("http://localhost:3001/api/v1/workspace/demo").respond(
+        status_code=200,
+        text=body,
+        headers={"Content-Type": "application/json; charset=utf-8"},
+    )
+    result = await server.get_workspace("demo")
+    assert route.called
+    assert result == body
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_list_models_served_from_cache_within_ttl(
+    router: respx.MockRouter,
+) -> None:
+    route = router.get("http://localhost:3001/api/v1/openai/models").respond(
+        status_code=200,
+        json={"data": [{"id": "llama3"}]},
+    )
+    first = await server.list_models()
+    second = await server.list_models()
+    assert route.call_count == 1
+    assert first == second
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_create_workspace_invalidates_workspace_cache(
+    router: respx.MockRouter,
+) -> None:
+    route = router.get("http://localhost:3001/api/v1/workspaces").respond(
+        status_code=200,
+        json={"workspaces": []},
+    )
+    router.post("http://localhost:3001/api/v1/workspace/new").respond(
+        status_code=200,
+        json={"workspace": {"slug": "demo"}},
+    )
+    await server.list_workspaces()
+    await server.create_workspace("demo")
+    await server.list_workspaces()
+    assert route.call_count == 2
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_list_workspaces_overlapping_create_is_not_cached(
+    router: respx.MockRouter,
+) -> None:
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def stale_then_fresh(request: httpx.Request) -> httpx.Response:
+        if not started.is_set():
+            started.set()
+            await release.wait()
+            return httpx.Response(200, json={"workspaces": []})
+        return httpx.Response(200, json={"workspaces": [{"slug": "demo"}]})
+
+    route = router.get("http://localhost:3001/api/v1/workspaces").mock(
+        side_effect=stale_then_fresh,
+    )
+    router.post("http://localhost:3001/api/v1/workspace/new").respond(
+        status_code=200,
+        json={"workspace": {"slug": "demo"}},
+    )
+    listing = asyncio.create_task(server.list_workspaces())
+    await started.wait()
+    await server.create_workspace("demo")
+    release.set()
+    await listing
+    result = await server.list_workspaces()
+    assert route.call_count == 2
+    assert '"slug":"demo"' in result
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_delete_workspace_invalidates_vector_count_cache(
+    router: respx.MockRouter,
+) -> None:
+    route = router.get("http://localhost:3001/api/v1/system/vector-count").respond(
+        status_code=200,
+        json={"vectorCount": 10},
+    )
+    router.delete("http://localhost:3001/api/v1/workspace/demo").respond(
+        status_code=200,
+        json={},
+    )
+    await server.get_vector_count()
+    await server.delete_workspace("demo")
+    await server.get_vector_count()
+    assert route.call_count == 2
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_list_workspaces_summarizes_workspaces(
+    router: respx.MockRouter,
+) -> None:
+    route = router.get("http://localhost:3001/api/v1/workspaces").respond(
+        status_code=200,
+        json={"workspaces": [
+            {"name": "Demo", "slug": "demo", "threads": [{"slug": "t1"}]},
+            {"name": "Empty", "slug": "empty", "threads": None},
+        ]},
+    )
+    result = await server.list_workspaces()
+    assert route.called
+    assert '"total":2' in result
+    assert '"threads":1' in result
+    assert '"threads":0' in result
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_update_workspace_sends_only_provided_fields(
+    router: respx.MockRouter,
+) -> None:
+    route = router.post("http://localhost:3001/api/v1/workspace/demo/update").respond(
+        status_code=200,
+        json={"workspace": {"slug": "demo"}},
+    )
+    await server.update_workspace("demo", openAiTemp=0.0, chatMode=server.ChatMode.QUERY)
+    assert json.loads(route.calls.last.request.content) == {"openAiTemp": 0.0, "chatMode": "query"}
+
+
+def test_handle_error_includes_upstream_body() -> None:
+    request = httpx.Request("GET", "http://localhost:3001/api/v1/workspace/missing")
+    response = httpx.Response(404, text='{"error":"not found"}', request=request)
+    error = httpx.HTTPStatusError("not found", request=request, response=response)
+    message = server._handle_error(error)
+    assert message == 'Error: Resource not found. Check the slug or ID.\nDetails: {"error":"not found"}'
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_list_workspaces_detailed_fetches_each_workspace(
+    router: respx.MockRouter,
+) -> None:
+    router.get("http://localhost:3001/api/v1/workspaces").respond(
+        status_code=200,
+        json={"workspaces": [{"name": "Demo", "slug": "demo"}, {"name": "Gone", "slug": "gone"}]},
+    )
+    router.get("http://localhost:3001/api/v1/workspace/demo").respond(
+        status_code=200,
+        json={"workspace": [{"slug": "demo", "openAiTemp": 0.7}]},
+    )
+    router.get("http://localhost:3001/api/v1/workspace/gone").respond(status_code=404)
+    result = await server.list_workspaces(detailed=True)
+    workspaces = json.loads(result)["workspaces"]
+    assert workspaces[0]["details"] == {"workspace": [{"slug": "demo", "openAiTemp": 0.7}]}
+    assert workspaces[1]["details"].startswith("Error: Resource not found")
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_list_workspaces_detailed_skips_entries_without_slug(
+    router: respx.MockRouter,
+) -> None:
+    router.get("http://localhost:3001/api/v1/workspaces").respond(
+        status_code=200,
+        json={"workspaces": [{"name": "Orphan"}, {"name": "Demo", "slug": "demo"}]},
+    )
+    route = router.get("http://localhost:3001/api/v1/workspace/demo").respond(
+        status_code=200,
+        json={"workspace": [{"slug": "demo"}]},
+    )
+    result = await server.list_workspaces(detailed=True)
+    workspaces = json.loads(result)["workspaces"]
+    assert route.call_count == 1
+    assert "details" not in workspaces[0]
+    assert workspaces[1]["details"] == {"workspace": [{"slug": "demo"}]}
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_export_chats_streams_body_verbatim(
+    router: respx.MockRouter,
+) -> None:
+    body = '[{"prompt":"Olá","response":"Oi"}]'
+    route = router.get("http://localhost:3001/api/v1/system/export-chats").respond(
+        status_code=200,
+        content=body.encode(),
+        headers={"Content-Type": "application/json; charset=utf-8"},
+    )
+    result = await server.export_chats()
+    assert route.called
+    assert result == body
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_export_chats_reports_http_errors(
+    router: respx.MockRouter,
+) -> None:
+    route = router.get("http://localhost:3001/api/v1/system/export-chats").respond(
+        status_code=401,
+        json={"error": "invalid key"},
+    )
+    result = await server.export_chats()
+    assert route.called
+    assert result.startswith("Error: Authentication failed")
+    assert "invalid key" in result
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_bulk_delete_workspaces_reports_each_slug(
+    router: respx.MockRouter,
+) -> None:
+    router.delete("http://localhost:3001/api/v1/workspace/a").respond(status_code=200)
+    router.delete("http://localhost:3001/api/v1/workspace/b").respond(status_code=404)
+    result = await server.bulk_delete_workspaces(["a", "b"])
+    summary = json.loads(result)
+    assert summary["deleted"] == ["a"]
+    assert summary["failed"][0]["slug"] == "b"
+    assert summary["failed"][0]["error"].startswith("Error: Resource not found")
+
+
+@pytest.mark.usefixtures("api_key")
+async def test_chat_in_thread_sends_mode_as_string(
+    router: respx.MockRouter,
+) -> None:
+    route = router.post("http://localhost:3001/api/v1/workspace/demo/thread/t1/chat").respond(
+        status_code=200,
+        json={"textResponse": "hi"},
+    )
+    await server.chat_in_thread("demo", "t1", "hello", server.ChatMode.QUERY)
+    assert json.loads(route.calls.last.request.content) == {"message": "hello", "mode": "query"}